@@ -6,9 +6,16 @@ Export real temple data for HTML prototype
 import sqlite3
 import json
 from datetime import datetime
+from pathlib import Path
+
+# Get project root
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+DB_PATH = PROJECT_ROOT / 'project-data' / 'database' / 'temple_app_mvp.db'
+OUTPUT_PATH = PROJECT_ROOT / 'design' / 'mockups' / 'demo-ui' / 'temple_data.json'
 
 def export_temple_data():
-    conn = sqlite3.connect('temple_app_mvp.db')
+    conn = sqlite3.connect(DB_PATH)
     conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
     
@@ -89,13 +96,14 @@ def export_temple_data():
     }
     
     # Save to JSON
-    with open('demo-ui/temple_data.json', 'w', encoding='utf-8') as f:
+    OUTPUT_PATH.parent.mkdir(exist_ok=True)
+    with open(OUTPUT_PATH, 'w', encoding='utf-8') as f:
         json.dump(data, f, ensure_ascii=False, indent=2)
     
     print(f"✅ Exported {len(temples)} navigation-ready temples")
     print(f"✅ Exported {len(circuits)} tour circuits")
     print(f"✅ Exported {len(directory)} total temples")
-    print(f"📁 Saved to: demo-ui/temple_data.json")
+    print(f"📁 Saved to: {OUTPUT_PATH.relative_to(PROJECT_ROOT)}")
     
     conn.close()
 
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Build the compact, read-only database shipped inside the Flutter app
+
+Combines temple_app_mvp.db and app_temples_unified.db into a single
+distribution database that keeps only the columns the app reads, drops
+build-time fields (search_text, last_updated, data_sources...), adds
+precomputed lookup tables for the home/tour/festival screens, and is written
+with VACUUM INTO at a tuned page size. Prints size and cold-open timings.
+
+Usage:
+    python3 utils/build_mobile_db.py [--page-size 4096]
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from road_network import ensure_travel_times_table
+from temple_listing import ensure_listing_indexes
+
+# Get project root
+PROJECT_ROOT = Path(__file__).parent.parent
+
+DATABASE_DIR = PROJECT_ROOT / 'project-data' / 'database'
+MVP_DB_PATH = DATABASE_DIR / 'temple_app_mvp.db'
+UNIFIED_DB_PATH = DATABASE_DIR / 'app_temples_unified.db'
+OUTPUT_PATH = DATABASE_DIR / 'temple_app_mobile.db'
+
+# Matches the flash/filesystem block size on Android and iOS devices
+DEFAULT_PAGE_SIZE = 4096
+SCHEMA_VERSION = 1
+
+# Tables, in the shape the app reads them; populated from the attached sources
+MOBILE_SCHEMA = '''
+    CREATE TABLE app_temples (
+        id TEXT PRIMARY KEY,
+        name TEXT NOT NULL,
+        tamil_name TEXT,
+        district TEXT NOT NULL,
+        latitude REAL NOT NULL,
+        longitude REAL NOT NULL,
+        deity_type TEXT,
+        gm_rating REAL,
+        gm_address TEXT,
+        gm_phone TEXT,
+        gm_website TEXT,
+        popular_times TEXT, -- JSON array for crowd levels
+        is_tour_temple INTEGER,
+        data_quality TEXT
+    ) WITHOUT ROWID;
+
+    CREATE TABLE temple_directory (
+        id TEXT PRIMARY KEY,
+        name TEXT NOT NULL,
+        tamil_name TEXT,
+        district TEXT NOT NULL,
+        deity_type TEXT,
+        navigation_available INTEGER
+    ) WITHOUT ROWID;
+
+    CREATE TABLE temple_enrichments (
+        temple_id TEXT PRIMARY KEY,
+        deity_main TEXT,
+        deity_others TEXT,     -- JSON array
+        holy_water TEXT,       -- JSON array
+        sacred_tree TEXT,
+        timings TEXT,
+        historical_info TEXT,
+        special_features TEXT, -- JSON array
+        festivals TEXT,        -- JSON array
+        how_to_reach TEXT
+    ) WITHOUT ROWID;
+
+    CREATE TABLE tour_circuits (
+        id TEXT PRIMARY KEY,
+        name TEXT NOT NULL,
+        tamil_name TEXT,
+        description TEXT,
+        circuit_type TEXT,
+        total_temples INTEGER,
+        total_distance_km REAL,
+        estimated_hours REAL,
+        best_season TEXT,
+        significance TEXT
+    ) WITHOUT ROWID;
+
+    CREATE TABLE festivals (
+        id INTEGER PRIMARY KEY,
+        date TEXT NOT NULL,
+        name TEXT NOT NULL,
+        tamil_name TEXT,
+        type TEXT,
+        category TEXT,
+        temples TEXT,
+        tamil_month TEXT,
+        year INTEGER
+    );
+
+    -- Precomputed lookups
+    CREATE TABLE district_counts (
+        district TEXT PRIMARY KEY,
+        total INTEGER NOT NULL,
+        navigation_ready INTEGER NOT NULL -- temples with navigation_available set
+    ) WITHOUT ROWID;
+
+    CREATE TABLE circuit_membership (
+        circuit_id TEXT NOT NULL,
+        sequence_order INTEGER NOT NULL,
+        temple_id TEXT NOT NULL,
+        significance TEXT,
+        PRIMARY KEY (circuit_id, sequence_order)
+    ) WITHOUT ROWID;
+
+    CREATE TABLE festivals_by_month (
+        month TEXT NOT NULL, -- 'YYYY-MM'
+        festival_id INTEGER NOT NULL,
+        PRIMARY KEY (month, festival_id)
+    ) WITHOUT ROWID;
+
+    CREATE INDEX idx_directory_deity ON temple_directory(deity_type);
+    CREATE INDEX idx_festivals_year_date ON festivals(year, date);
+    CREATE INDEX idx_festivals_type_date ON festivals(type, date);
+    CREATE INDEX idx_circuit_membership_temple ON circuit_membership(temple_id);
+'''
+
+COPY_STATEMENTS = [
+    '''INSERT INTO app_temples
+       SELECT id, name, tamil_name, district, latitude, longitude, deity_type,
+              gm_rating, gm_address, gm_phone, gm_website, popular_times,
+              is_tour_temple, data_quality
+       FROM mvp.app_temples''',
+    '''INSERT INTO temple_directory
+       SELECT id, name, tamil_name, district, deity_type, navigation_available
+       FROM mvp.temple_directory''',
+    '''INSERT OR REPLACE INTO temple_enrichments
+       SELECT e.temple_id, e.deity_main, e.deity_others, e.holy_water, e.sacred_tree,
+              e.timings, e.historical_info, e.special_features, e.festivals, e.how_to_reach
+       FROM unified.temple_enrichments e
+       JOIN mvp.temple_directory d ON d.id = e.temple_id''',
+    '''INSERT INTO tour_circuits SELECT * FROM mvp.tour_circuits''',
+    '''INSERT INTO festivals
+       SELECT id, date, name, tamil_name, type, category, temples, tamil_month, year
+       FROM mvp.festivals''',
+    '''INSERT INTO district_counts
+       SELECT district, COUNT(*),
+              SUM(CASE WHEN navigation_available THEN 1 ELSE 0 END)
+       FROM temple_directory
+       GROUP BY district''',
+    '''INSERT INTO circuit_membership
+       SELECT circuit_id, sequence_order, temple_id, significance
+       FROM mvp.circuit_temples''',
+    '''INSERT INTO festivals_by_month
+       SELECT substr(date, 1, 7), id FROM festivals''',
+]
+
+# Queries the app runs on its first screens, used for the cold-open timing
+FIRST_SCREEN_QUERIES = [
+    'SELECT * FROM district_counts ORDER BY total DESC',
+    'SELECT * FROM app_temples ORDER BY COALESCE(gm_rating, 0) DESC, id LIMIT 50',
+    '''SELECT f.* FROM festivals_by_month m JOIN festivals f ON f.id = m.festival_id
+       WHERE m.month = (SELECT MIN(month) FROM festivals_by_month)''',
+]
+
+
+def build_mobile_database(page_size=DEFAULT_PAGE_SIZE):
+    """Build temple_app_mobile.db from the two source databases"""
+
+    for path in (MVP_DB_PATH, UNIFIED_DB_PATH):
+        if not path.exists():
+            print(f"Error: Database not found at {path}")
+            return False
+
+    print("📦 Building mobile database...")
+
+    # Build in memory so the only file write is the final compacted copy
+    conn = sqlite3.connect(':memory:', uri=True)
+    conn.execute(f'PRAGMA page_size = {page_size}')
+    conn.execute('ATTACH DATABASE ? AS mvp', (f'file:{MVP_DB_PATH}?mode=ro',))
+    conn.execute('ATTACH DATABASE ? AS unified', (f'file:{UNIFIED_DB_PATH}?mode=ro',))
+    conn.executescript(MOBILE_SCHEMA)
+    for statement in COPY_STATEMENTS:
+        conn.execute(statement)
+
+    # Travel times are only present once road_network.py has been run
+    has_travel_times = conn.execute(
+        "SELECT 1 FROM mvp.sqlite_master WHERE type = 'table' AND name = 'travel_times'"
+    ).fetchone()
+    if has_travel_times:
+        ensure_travel_times_table(conn)
+        conn.execute('INSERT INTO main.travel_times SELECT * FROM mvp.travel_times')
+
+    ensure_listing_indexes(conn)
+    conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+    conn.commit()
+    conn.execute('DETACH DATABASE mvp')
+    conn.execute('DETACH DATABASE unified')
+    conn.execute('ANALYZE')
+    conn.commit()
+
+    if OUTPUT_PATH.exists():
+        OUTPUT_PATH.unlink()
+    conn.execute('VACUUM INTO ?', (str(OUTPUT_PATH),))
+    conn.close()
+
+    report(page_size)
+    return True
+
+
+# Run in a fresh process so no SQLite or Python state is shared with the build
+OPEN_TIMING_SCRIPT = '''
+import json, sqlite3, sys, time
+path, queries = sys.argv[1], json.loads(sys.argv[2])
+start = time.perf_counter()
+conn = sqlite3.connect(f'file:{path}?mode=ro&immutable=1', uri=True)
+conn.execute('SELECT COUNT(*) FROM sqlite_master').fetchone()
+opened = time.perf_counter()
+for query in queries:
+    conn.execute(query).fetchall()
+print(json.dumps([(opened - start) * 1000, (time.perf_counter() - opened) * 1000]))
+'''
+
+
+def drop_from_page_cache(path):
+    """Evict a file's pages from the OS page cache; False where that is not supported"""
+    if not hasattr(os, 'posix_fadvise'):
+        return False
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    finally:
+        os.close(fd)
+    return True
+
+
+def time_first_open(path):
+    """(open ms, first screen queries ms, cold) for a new process opening path"""
+    cold = drop_from_page_cache(path)
+    result = subprocess.run(
+        [sys.executable, '-c', OPEN_TIMING_SCRIPT, str(path), json.dumps(FIRST_SCREEN_QUERIES)],
+        capture_output=True, text=True, check=True
+    )
+    open_ms, query_ms = json.loads(result.stdout)
+    return open_ms, query_ms, cold
+
+
+def report(page_size):
+    """Print size and first-open/first-query timings for the mobile database"""
+    source_size = MVP_DB_PATH.stat().st_size + UNIFIED_DB_PATH.stat().st_size
+    output_size = OUTPUT_PATH.stat().st_size
+
+    # The file was just written, so without eviction it is still in the page cache
+    open_ms, query_ms, cold = time_first_open(OUTPUT_PATH)
+
+    conn = sqlite3.connect(f'file:{OUTPUT_PATH}?mode=ro&immutable=1', uri=True)
+    counts = {
+        table: conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+        for table in ('app_temples', 'temple_directory', 'temple_enrichments', 'festivals')
+    }
+    conn.close()
+
+    print(f"\n✅ Mobile database built: {OUTPUT_PATH.name}")
+    print(f"   Size: {output_size / 1024:.0f} KB "
+          f"(sources {source_size / 1024:.0f} KB, page_size {page_size})")
+    label = 'Cold open' if cold else 'Open (warm page cache)'
+    print(f"   {label}: {open_ms:.1f} ms, first screen queries: {query_ms:.1f} ms")
+    for table, count in counts.items():
+        print(f"   - {table}: {count}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Build the read-only mobile database')
+    parser.add_argument('--page-size', type=int, default=DEFAULT_PAGE_SIZE,
+                        help='SQLite page size for the output (power of two, 512-65536)')
+    args = parser.parse_args()
+
+    success = build_mobile_database(args.page_size)
+    sys.exit(0 if success else 1)
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Build the HTML prototype bundle with its data as separate compressed assets
+
+design/mockups/index.html is the template: it no longer carries inlined
+festival or circuit data and instead fetches design/mockups/data/*.json on
+demand. This script regenerates those data assets from the festivals and
+tour_circuits tables, then writes a minified bundle to design/mockups/dist/
+(HTML with inline CSS/JS minified, JSON assets minified and pre-gzipped) and
+reports payload size and JSON parse cost per asset.
+
+Replaces update_html_festivals.py, which spliced a JS array into index.html.
+
+Usage:
+    python3 utils/build_prototype.py
+"""
+
+import gzip
+import json
+import re
+import sqlite3
+import time
+from pathlib import Path
+
+# Get project root
+PROJECT_ROOT = Path(__file__).parent.parent
+
+MOCKUPS_DIR = PROJECT_ROOT / 'design' / 'mockups'
+DATA_DIR = MOCKUPS_DIR / 'data'
+DIST_DIR = MOCKUPS_DIR / 'dist'
+DB_PATH = PROJECT_ROOT / 'project-data' / 'database' / 'temple_app_mvp.db'
+
+TEMPLATE_PATH = MOCKUPS_DIR / 'index.html'
+
+# Assets fetched by the prototype, relative to design/mockups/
+DATA_ASSETS = [
+    'temple_data.json',
+    'app_strings.json',
+    'data/festivals.json',
+    'data/tour_circuits.json',
+]
+
+# Top-level keys the page reads; anything else (e.g. festivals merged in by
+# add_festivals_to_json.py) duplicates a separate asset and is left out
+BUNDLED_KEYS = {
+    'temple_data.json': ('app_temples',),
+}
+
+
+def export_festivals():
+    """Write data/festivals.json from the festivals table (same shape the page used inline)"""
+    conn = sqlite3.connect(DB_PATH)
+    conn.row_factory = sqlite3.Row
+    festivals = []
+    for row in conn.execute('''
+        SELECT date, name, tamil_name, temples, type, category, tamil_month
+        FROM festivals
+        ORDER BY date, id
+    '''):
+        festival = dict(row)
+        if not festival['tamil_month']:
+            del festival['tamil_month']
+        festivals.append(festival)
+    conn.close()
+
+    DATA_DIR.mkdir(exist_ok=True)
+    with open(DATA_DIR / 'festivals.json', 'w', encoding='utf-8') as f:
+        json.dump(festivals, f, ensure_ascii=False, indent=2)
+        f.write('\n')
+    return len(festivals)
+
+
+def export_tour_circuits():
+    """Write data/tour_circuits.json from the tour_circuits table"""
+    conn = sqlite3.connect(DB_PATH)
+    conn.row_factory = sqlite3.Row
+    circuits = [dict(row) for row in conn.execute('SELECT * FROM tour_circuits ORDER BY id')]
+    conn.close()
+
+    DATA_DIR.mkdir(exist_ok=True)
+    with open(DATA_DIR / 'tour_circuits.json', 'w', encoding='utf-8') as f:
+        json.dump(circuits, f, ensure_ascii=False, indent=2)
+        f.write('\n')
+    return len(circuits)
+
+
+def minify_css(css):
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{};,>])\s*', r'\1', css)
+    css = re.sub(r':\s+', ':', css)
+    return css.replace(';}', '}').strip()
+
+
+def minify_js(js):
+    # Line-based only: newlines are kept so automatic semicolon insertion
+    # behaves exactly as in the template
+    lines = []
+    for line in js.splitlines():
+        line = line.strip()
+        if line and not line.startswith('//'):
+            lines.append(line)
+    return '\n'.join(lines)
+
+
+def minify_html(html):
+    parts = re.split(r'(<style[^>]*>.*?</style>|<script[^>]*>.*?</script>)', html, flags=re.S)
+    output = []
+    for part in parts:
+        if part.startswith('<style'):
+            open_tag, body = part.split('>', 1)
+            output.append(open_tag + '>' + minify_css(body[:-len('</style>')]) + '</style>')
+        elif part.startswith('<script'):
+            open_tag, body = part.split('>', 1)
+            output.append(open_tag + '>' + minify_js(body[:-len('</script>')]) + '</script>')
+        else:
+            part = re.sub(r'<!--(?!\[if).*?-->', '', part, flags=re.S)
+            output.append('\n'.join(line.strip() for line in part.splitlines() if line.strip()))
+    return ''.join(output)
+
+
+def write_compressed(path, content):
+    """Write content and a pre-gzipped sibling; returns (raw_bytes, gzip_bytes)"""
+    data = content.encode('utf-8')
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    compressed = gzip.compress(data, compresslevel=9, mtime=0)
+    path.with_name(path.name + '.gz').write_bytes(compressed)
+    return len(data), len(compressed)
+
+
+def build_prototype():
+    """Regenerate data assets and write the minified bundle to dist/"""
+
+    print("🏗️  Building prototype bundle...")
+    festival_count = export_festivals()
+    print(f"   Exported {festival_count} festivals to data/festivals.json")
+    circuit_count = export_tour_circuits()
+    print(f"   Exported {circuit_count} tour circuits to data/tour_circuits.json")
+
+    rows = []
+
+    template = TEMPLATE_PATH.read_text(encoding='utf-8')
+    scripts = re.findall(r'<script[^>]*>(.*?)</script>', template, flags=re.S)
+    raw, packed = write_compressed(DIST_DIR / 'index.html', minify_html(template))
+    rows.append(('index.html', len(template.encode('utf-8')), raw, packed,
+                 f"{sum(len(s) for s in scripts) / 1024:.0f} KB inline JS"))
+
+    for asset in DATA_ASSETS:
+        source = MOCKUPS_DIR / asset
+        text = source.read_text(encoding='utf-8')
+        data = json.loads(text)
+        if asset in BUNDLED_KEYS:
+            data = {key: data[key] for key in BUNDLED_KEYS[asset] if key in data}
+        minified = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+        # Parse cost of what the page actually downloads
+        start = time.perf_counter()
+        json.loads(minified)
+        parse_ms = (time.perf_counter() - start) * 1000
+        raw, packed = write_compressed(DIST_DIR / asset, minified)
+        rows.append((asset, len(text.encode('utf-8')), raw, packed, f"parse {parse_ms:.1f} ms"))
+
+    print(f"\n✅ Bundle written to {DIST_DIR.relative_to(PROJECT_ROOT)}/")
+    print(f"   {'file':26} {'source':>9} {'minified':>9} {'gzip':>9}")
+    for name, source_size, raw, packed, note in rows:
+        print(f"   {name:26} {source_size / 1024:8.1f}K {raw / 1024:8.1f}K {packed / 1024:8.1f}K  {note}")
+
+    first_paint = rows[0][3] + sum(r[3] for r in rows[1:] if r[0] in ('app_strings.json',))
+    print(f"\n   First paint payload (gzip): {first_paint / 1024:.1f} KB; "
+          f"festivals and temple data load after the shell renders")
+    return True
+
+
+if __name__ == "__main__":
+    build_prototype()
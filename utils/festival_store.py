@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Multi-year festival store for temple_app_mvp.db
+
+Festivals are identified by their natural key (date, type, name), so loading
+a year's calendar is an idempotent batched upsert that never touches other
+years. Each row records its source ('calendar' for festivals_YYYY_complete.json,
+'unified' for app_temples_unified.db) and a load only prunes rows of its own
+source. Composite indexes on (year, date) and (type, date) keep month-range and
+"next N observances" queries to a single index range scan however many years
+are loaded.
+
+Usage:
+    python3 utils/festival_store.py load <calendar.json>   # e.g. festivals_2025_complete.json
+    python3 utils/festival_store.py import-unified         # festivals from app_temples_unified.db
+    python3 utils/festival_store.py next <type> [count]
+    python3 utils/festival_store.py month <YYYY-MM> [YYYY-MM]
+"""
+
+import json
+import sqlite3
+import sys
+from datetime import date
+from pathlib import Path
+
+# Get project root
+PROJECT_ROOT = Path(__file__).parent.parent
+
+DB_PATH = PROJECT_ROOT / 'project-data' / 'database' / 'temple_app_mvp.db'
+UNIFIED_DB_PATH = PROJECT_ROOT / 'project-data' / 'database' / 'app_temples_unified.db'
+
+FESTIVAL_COLUMNS = ('date', 'name', 'tamil_name', 'type', 'category', 'temples', 'tamil_month', 'year')
+
+# Display values shared by every observance of a monthly type
+MONTHLY_TYPES = {
+    'pradosham': ('பிரதோஷம்', 'All Shiva temples - Evening prayers'),
+    'ekadashi': ('ஏகாதசி', 'All Vishnu temples - Fasting day'),
+    'pournami': ('பௌர்ணமி', 'All temples - Full moon worship'),
+    'amavasya': ('அமாவாசை', 'Ancestor worship at temples'),
+}
+
+# type is NOT NULL because the unique index treats NULLs as distinct
+FESTIVAL_SCHEMA = [
+    '''CREATE TABLE IF NOT EXISTS festivals (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        date TEXT NOT NULL,
+        name TEXT NOT NULL,
+        tamil_name TEXT,
+        type TEXT NOT NULL DEFAULT '',
+        category TEXT,
+        temples TEXT,
+        tamil_month TEXT,
+        year INTEGER,
+        source TEXT NOT NULL DEFAULT 'calendar'
+    )''',
+    'CREATE UNIQUE INDEX IF NOT EXISTS idx_festivals_natural_key ON festivals(date, type, name)',
+    'CREATE INDEX IF NOT EXISTS idx_festivals_year_date ON festivals(year, date)',
+    'CREATE INDEX IF NOT EXISTS idx_festivals_type_date ON festivals(type, date)',
+]
+
+
+def ensure_festival_store(conn):
+    """Create or migrate the festivals table and its indexes (call before writing)
+
+    Tables from before the store are rebuilt with a NOT NULL type and a source
+    column (existing rows count as 'calendar'), and natural-key duplicates are
+    collapsed before the unique index is created.
+    """
+    columns = [row[1] for row in conn.execute('PRAGMA table_info(festivals)')]
+    if columns and 'source' not in columns:
+        conn.execute('ALTER TABLE festivals RENAME TO festivals_old')
+        conn.execute(FESTIVAL_SCHEMA[0])
+        conn.execute(f'''
+            INSERT INTO festivals (id, {', '.join(FESTIVAL_COLUMNS)}, source)
+            SELECT id, date, name, tamil_name, COALESCE(type, ''), category, temples,
+                   tamil_month, year, 'calendar'
+            FROM festivals_old
+        ''')
+        conn.execute('DROP TABLE festivals_old')
+    else:
+        conn.execute(FESTIVAL_SCHEMA[0])
+    conn.execute('''
+        DELETE FROM festivals
+        WHERE id NOT IN (SELECT MAX(id) FROM festivals GROUP BY date, type, name)
+    ''')
+    for statement in FESTIVAL_SCHEMA[1:]:
+        conn.execute(statement)
+    conn.commit()
+
+
+def festivals_from_calendar(data):
+    """Flatten a festivals_YYYY_complete.json calendar into festival rows
+
+    Each row's year comes from its date. The calendar must declare its year
+    and every date must fall in it, so a mislabelled file is rejected rather
+    than pruning (or being filed under) some other year.
+    """
+    if 'year' not in data:
+        raise ValueError("Calendar has no 'year'; refusing to guess which year it replaces")
+    year = int(data['year'])
+    festivals = []
+
+    # Process major annual festivals
+    for fest in data.get('major_annual_festivals', []):
+        festivals.append({
+            'date': fest['date'],
+            'name': fest['name'],
+            'tamil_name': fest.get('tamil_name', ''),
+            'type': 'major',
+            'category': 'annual',
+            'temples': 'All major temples',
+            'tamil_month': '',
+            'year': int(fest['date'][:4])
+        })
+
+    # Process monthly observances (Pradosham, Ekadashi, Pournami, Amavasya)
+    default_names = {
+        'pradosham': 'Pradosham',
+        'ekadashi': 'Ekadashi',
+        'pournami': 'Pournami (Full Moon)',
+        'amavasya': 'Amavasya (New Moon)',
+    }
+    for festival_type, (tamil_name, temples) in MONTHLY_TYPES.items():
+        for fest in data.get('festivals', {}).get(festival_type, []):
+            if festival_type in ('pradosham', 'ekadashi'):
+                name = fest.get('type', default_names[festival_type])
+            else:
+                name = default_names[festival_type]
+            festivals.append({
+                'date': fest['date'],
+                'name': name,
+                'tamil_name': tamil_name,
+                'type': festival_type,
+                'category': 'monthly',
+                'temples': temples,
+                'tamil_month': fest.get('tamil_month', ''),
+                'year': int(fest['date'][:4])
+            })
+
+    outside = [fest for fest in festivals if fest['year'] != year]
+    if outside:
+        raise ValueError(f"{outside[0]['name']} on {outside[0]['date']} is outside the {year} calendar")
+    return year, festivals
+
+
+def upsert_festivals(conn, festivals, source='calendar', prune=True):
+    """Idempotently load festivals; years with no row in the batch are left untouched
+
+    With `prune`, festivals from the same `source` in the years the batch
+    covers (each row's `year`) that are no longer in the batch (e.g. a
+    corrected date) are removed so those years match the source exactly; rows
+    loaded from other sources are kept. A festival present in several sources
+    belongs to whichever loaded it last.
+    Returns (rows written, rows pruned).
+    """
+    years = sorted({fest['year'] for fest in festivals})
+    rows = [tuple(fest[column] for column in FESTIVAL_COLUMNS) + (source,) for fest in festivals]
+    with conn:
+        conn.executemany(f'''
+            INSERT INTO festivals ({', '.join(FESTIVAL_COLUMNS)}, source)
+            VALUES ({', '.join('?' * (len(FESTIVAL_COLUMNS) + 1))})
+            ON CONFLICT(date, type, name) DO UPDATE SET
+                tamil_name = excluded.tamil_name,
+                category = excluded.category,
+                temples = excluded.temples,
+                tamil_month = excluded.tamil_month,
+                year = excluded.year,
+                source = excluded.source
+        ''', rows)
+
+        pruned = 0
+        if prune and years:
+            conn.execute('CREATE TEMP TABLE IF NOT EXISTS festival_keys (date TEXT, type TEXT, name TEXT)')
+            conn.execute('DELETE FROM festival_keys')
+            conn.executemany('INSERT INTO festival_keys VALUES (?, ?, ?)',
+                             [(fest['date'], fest['type'], fest['name']) for fest in festivals])
+            pruned = conn.execute(f'''
+                DELETE FROM festivals
+                WHERE year IN ({', '.join('?' * len(years))}) AND source = ?
+                  AND NOT EXISTS (
+                      SELECT 1 FROM festival_keys k
+                      WHERE k.date = festivals.date AND k.type = festivals.type AND k.name = festivals.name
+                  )
+            ''', years + [source]).rowcount
+            conn.execute('DROP TABLE festival_keys')
+    return len(rows), pruned
+
+
+def next_observances(conn, festival_type, count=5, from_date=None):
+    """The next `count` festivals of `festival_type` on or after from_date (default today)"""
+    conn.row_factory = sqlite3.Row
+    from_date = from_date or date.today().isoformat()
+    return [dict(row) for row in conn.execute(f'''
+        SELECT {', '.join(FESTIVAL_COLUMNS)}
+        FROM festivals
+        WHERE type = ? AND date >= ?
+        ORDER BY date
+        LIMIT ?
+    ''', (festival_type, from_date, count))]
+
+
+def festivals_in_months(conn, start_month, end_month=None):
+    """All festivals from start_month to end_month inclusive ('YYYY-MM')"""
+    conn.row_factory = sqlite3.Row
+    end_month = end_month or start_month
+    end_year, end_mon = map(int, end_month.split('-'))
+    after_end = f'{end_year + end_mon // 12:04d}-{end_mon % 12 + 1:02d}-01'
+    # The year bounds let SQLite range-scan idx_festivals_year_date
+    return [dict(row) for row in conn.execute(f'''
+        SELECT {', '.join(FESTIVAL_COLUMNS)}
+        FROM festivals
+        WHERE year BETWEEN ? AND ?
+          AND date >= ? AND date < ?
+        ORDER BY year, date
+    ''', (int(start_month[:4]), end_year, f'{start_month}-01', after_end))]
+
+
+def import_unified_festivals(conn, unified_path=UNIFIED_DB_PATH):
+    """Fold the app_temples_unified.db festivals table into the store"""
+    source = sqlite3.connect(unified_path)
+    festivals = []
+    for fest_date, name, fest_type, tamil_month in source.execute(
+            'SELECT date, festival_name, type, tamil_month FROM festivals'):
+        tamil_name, temples = MONTHLY_TYPES.get(fest_type, ('', 'All major temples'))
+        festivals.append({
+            'date': fest_date,
+            'name': name,
+            'tamil_name': tamil_name,
+            'type': fest_type,
+            'category': 'monthly' if fest_type in MONTHLY_TYPES else 'annual',
+            'temples': temples,
+            'tamil_month': tamil_month or '',
+            'year': int(fest_date[:4])
+        })
+    source.close()
+
+    # Each covered year's unified rows are replaced as a set; calendar rows are untouched
+    return upsert_festivals(conn, festivals, source='unified')[0]
+
+
+if __name__ == "__main__":
+    conn = sqlite3.connect(DB_PATH)
+    args = sys.argv[1:]
+
+    # Only the write commands create or migrate the store
+    if args[:1] == ['load'] and len(args) == 2:
+        ensure_festival_store(conn)
+        with open(args[1], 'r', encoding='utf-8') as f:
+            year, festivals = festivals_from_calendar(json.load(f))
+        written, pruned = upsert_festivals(conn, festivals)
+        print(f"✅ Upserted {written} festivals for {year} ({pruned} stale removed)")
+    elif args[:1] == ['import-unified']:
+        ensure_festival_store(conn)
+        print(f"✅ Merged {import_unified_festivals(conn)} festivals from {UNIFIED_DB_PATH.name}")
+    elif args[:1] == ['next'] and len(args) >= 2:
+        for fest in next_observances(conn, args[1], int(args[2]) if len(args) > 2 else 5):
+            print(f"{fest['date']}  {fest['name']}")
+    elif args[:1] == ['month'] and len(args) >= 2:
+        for fest in festivals_in_months(conn, *args[1:3]):
+            print(f"{fest['date']}  {fest['type']:10} {fest['name']}")
+    else:
+        print(__doc__)
+        sys.exit(1)
+
+    conn.close()
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Bounded-memory reading and rewriting of app_temples-style JSON feeds
+
+temple_data.json (and the larger enrichment dumps) are a single object whose
+`app_temples` array dominates the file. These helpers parse that array one
+temple at a time, accept newline-delimited JSON (.ndjson / .jsonl) as well,
+and rewrite a feed in place through a streaming writer that produces the same
+bytes as json.dump(..., ensure_ascii=False, indent=2), so memory stays
+constant however large the feed grows.
+"""
+
+import json
+import os
+import re
+import tempfile
+from contextlib import contextmanager
+from itertools import islice
+from pathlib import Path
+
+CHUNK_SIZE = 1 << 16
+WHITESPACE = ' \t\n\r'
+NUMBER_CHARS = '0123456789.eE+-'
+NDJSON_SUFFIXES = ('.ndjson', '.jsonl')
+
+# Characters skip() has to look at, outside and inside strings
+_STRUCTURAL = re.compile(r'["\[\]{}]')
+_STRING_SPECIAL = re.compile(r'["\\]')
+_SCALAR_END = re.compile(r'[,\]}\s]')
+
+
+class _Reader:
+    """Incremental JSON value reader over a text file"""
+
+    def __init__(self, f):
+        self.f = f
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self, size=None):
+        chunk = self.f.read(size or CHUNK_SIZE)
+        if not chunk:
+            self.eof = True
+            return False
+        # Drop consumed text so the buffer only ever holds the current value
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Next non-whitespace character (without consuming it), or '' at EOF"""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} at offset {self.pos}, found {self.peek()!r}")
+        self.pos += 1
+
+    def value(self):
+        """Decode the next complete JSON value, reading more input as needed"""
+        self.peek()
+        # Double the read after each incomplete decode, so a value spanning
+        # many chunks is re-decoded O(log n) times rather than once per chunk
+        size = CHUNK_SIZE
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+                # A number cut at the end of the buffer (or at its '.', 'e'...)
+                # may continue in the next chunk
+                if self.eof or (end < len(self.buf) and self.buf[end] not in NUMBER_CHARS):
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._fill(size)
+            size *= 2
+
+    def skip(self):
+        """Consume the next JSON value without decoding it
+
+        Tracks bracket depth and string state only, and drops scanned text as
+        it goes, so skipping a large value needs neither its parse nor its text.
+        """
+        first = self.peek()
+        if not first:
+            raise ValueError(f"Expected a value at offset {self.pos}, found end of input")
+        if first not in '{["':
+            while True:
+                match = _SCALAR_END.search(self.buf, self.pos)
+                if match:
+                    self.pos = match.start()
+                    return
+                self.pos = len(self.buf)
+                if not self._fill():
+                    return
+
+        depth = 0
+        in_string = escaped = False
+        while True:
+            if self.pos >= len(self.buf):
+                if not self._fill():
+                    raise ValueError("Unterminated JSON value at end of input")
+                continue
+            if escaped:
+                escaped = False
+                self.pos += 1
+                continue
+            match = (_STRING_SPECIAL if in_string else _STRUCTURAL).search(self.buf, self.pos)
+            if not match:
+                self.pos = len(self.buf)
+                continue
+            char = match.group()
+            self.pos = match.end()
+            if in_string:
+                if char == '\\':
+                    escaped = True
+                else:
+                    in_string = False
+                    if depth == 0:
+                        return
+            elif char == '"':
+                in_string = True
+            elif char in '[{':
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return
+
+
+def _iter_object(reader):
+    """Yield (key, reader) for each member of an object; caller consumes the value"""
+    reader.expect('{')
+    if reader.peek() == '}':
+        reader.pos += 1
+        return
+    while True:
+        key = reader.value()
+        reader.expect(':')
+        yield key, reader
+        if reader.peek() == ',':
+            reader.pos += 1
+            continue
+        reader.expect('}')
+        return
+
+
+def _iter_array(reader):
+    reader.expect('[')
+    if reader.peek() == ']':
+        reader.pos += 1
+        return
+    while True:
+        yield reader.value()
+        if reader.peek() == ',':
+            reader.pos += 1
+            continue
+        reader.expect(']')
+        return
+
+
+def iter_ndjson(path):
+    """Yield one record per non-empty line of a newline-delimited JSON file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def iter_temples(path, key='app_temples'):
+    """Yield the records of `key` one at a time (or every line of an NDJSON feed)"""
+    path = Path(path)
+    if path.suffix in NDJSON_SUFFIXES:
+        yield from iter_ndjson(path)
+        return
+
+    with open(path, 'r', encoding='utf-8') as f:
+        reader = _Reader(f)
+        for name, _ in _iter_object(reader):
+            if name == key:
+                yield from _iter_array(reader)
+            else:
+                reader.skip()
+
+
+def batched(iterable, size):
+    """Split an iterable into lists of at most `size` items"""
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _dump_nested(value, depth):
+    """json.dump(indent=2) formatting for a value nested `depth` levels deep"""
+    text = json.dumps(value, ensure_ascii=False, indent=2)
+    return text.replace('\n', '\n' + '  ' * depth)
+
+
+def rewrite_json_stream(path, transform=None, key='app_temples', replace=None):
+    """Rewrite a feed in place, passing each `key` record through `transform`
+
+    `replace` maps top-level keys to new values; keys not already present are
+    appended. NDJSON feeds have no top-level keys, so `replace` is rejected
+    for them. The output is written to a temporary file and swapped in
+    atomically, so an interrupted run leaves the original untouched.
+    """
+    path = Path(path)
+    replace = dict(replace or {})
+
+    if path.suffix in NDJSON_SUFFIXES:
+        if replace:
+            raise ValueError(f"{path.name} is newline-delimited JSON; top-level keys cannot be replaced")
+        with _atomic_writer(path) as out:
+            for record in iter_ndjson(path):
+                record = transform(record) if transform else record
+                out.write(json.dumps(record, ensure_ascii=False) + '\n')
+        return
+
+    with open(path, 'r', encoding='utf-8') as f, _atomic_writer(path) as out:
+        reader = _Reader(f)
+        out.write('{')
+        first = True
+        for name, _ in _iter_object(reader):
+            out.write(('' if first else ',') + '\n  ' + json.dumps(name, ensure_ascii=False) + ': ')
+            first = False
+            if name in replace:
+                reader.skip()
+                out.write(_dump_nested(replace.pop(name), 1))
+            elif name == key and reader.peek() == '[':
+                _write_array(out, _iter_array(reader), transform)
+            else:
+                out.write(_dump_nested(reader.value(), 1))
+        for name, value in replace.items():
+            out.write(('' if first else ',') + '\n  ' + json.dumps(name, ensure_ascii=False) + ': ')
+            out.write(_dump_nested(value, 1))
+            first = False
+        out.write('\n}' if not first else '}')
+
+
+def _write_array(out, records, transform):
+    out.write('[')
+    empty = True
+    for record in records:
+        record = transform(record) if transform else record
+        out.write((',' if not empty else '') + '\n    ' + _dump_nested(record, 2))
+        empty = False
+    out.write(']' if empty else '\n  ]')
+
+
+@contextmanager
+def _atomic_writer(path):
+    """Write to a temporary sibling file and move it over `path` on success"""
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            yield f
+        if path.exists():
+            os.chmod(tmp_path, path.stat().st_mode & 0o777)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Incremental pipeline runner for the data rebuild scripts
+
+Each stage declares the script it runs, the working directory the script
+expects, and the files it reads and writes. Stages are fingerprinted (script +
+the inputs it does not itself write) and skipped when nothing changed since
+their last successful run. Files a stage edits in place are checked against
+the digest the pipeline last left them at instead, so replacing one outside
+the pipeline reruns every stage that edits it. Stages that touch disjoint
+files run in parallel.
+
+For the duration of a run the project databases are switched to WAL mode so
+readers (exports) never block on writers, then restored to rollback-journal
+mode so the tracked .db files are left as they were.
+
+Usage:
+    python3 utils/pipeline.py                 # run everything that is stale
+    python3 utils/pipeline.py --force sync    # rerun one stage regardless
+    python3 utils/pipeline.py --list
+"""
+
+import argparse
+import hashlib
+import sqlite3
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime
+from pathlib import Path
+
+# Get project root
+PROJECT_ROOT = Path(__file__).parent.parent
+
+STATE_DB_PATH = PROJECT_ROOT / 'project-data' / 'pipeline_state.db'
+
+TEMPLE_JSON = 'design/mockups/temple_data.json'
+UNIFIED_DB = 'project-data/database/app_temples_unified.db'
+MVP_DB = 'project-data/database/temple_app_mvp.db'
+FESTIVALS_JSON = 'project-data/festivals_2025_complete.json'
+
+# Databases that are read and written concurrently by stages and exports
+WAL_DATABASES = [UNIFIED_DB, MVP_DB]
+
+
+class Stage:
+    """One pipeline step: a script run from `cwd` that reads inputs and writes outputs"""
+
+    def __init__(self, name, script, cwd, inputs, outputs, args=()):
+        self.name = name
+        self.script = script
+        self.args = list(args)
+        self.cwd = cwd
+        self.inputs = inputs
+        self.outputs = outputs
+        self.depends_on = set()
+
+    @property
+    def sources(self):
+        """Inputs the stage does not rewrite itself (the ones fingerprinted)"""
+        return [path for path in self.inputs if path not in self.outputs]
+
+    @property
+    def in_place(self):
+        """Files the stage both reads and rewrites, e.g. temple_data.json edits
+
+        Their content after a run is not a function of the stage's inputs
+        (later stages may rewrite them again), so they are tracked through
+        file_digests instead of the fingerprint.
+        """
+        return [path for path in self.inputs if path in self.outputs]
+
+
+# Paths are relative to PROJECT_ROOT; cwd is where each script expects to be run.
+# In-place edits of temple_data.json come before the stages that read it.
+# Festivals are not merged into temple_data.json: the prototype loads them from
+# data/festivals.json (build_prototype.py), so add_festivals_to_json.py is not a stage.
+STAGES = [
+    Stage('districts', 'utils/update_temple_districts.py', '.',
+          inputs=[TEMPLE_JSON], outputs=[TEMPLE_JSON]),
+    Stage('sync', 'utils/sync_json_to_db.py', '.',
+          inputs=[TEMPLE_JSON, UNIFIED_DB], outputs=[UNIFIED_DB]),
+    Stage('festivals_db', 'utils/utils/update_database_with_festivals.py', 'utils',
+          inputs=[FESTIVALS_JSON, MVP_DB], outputs=[MVP_DB]),
+    Stage('listing_indexes', 'utils/temple_listing.py', '.',
+          inputs=[MVP_DB], outputs=[MVP_DB], args=['--create-indexes']),
+    Stage('prototype', 'utils/build_prototype.py', '.',
+          inputs=[MVP_DB, TEMPLE_JSON, 'design/mockups/index.html', 'design/mockups/app_strings.json'],
+          outputs=['design/mockups/data/festivals.json', 'design/mockups/data/tour_circuits.json',
+                   'design/mockups/dist/index.html']),
+    Stage('export', 'design/mockups/export_temple_data.py', 'design/mockups',
+          inputs=[MVP_DB], outputs=['design/mockups/demo-ui/temple_data.json']),
+]
+
+
+def resolve_dependencies(stages):
+    """Order stages by file hazards: read-after-write, write-after-read and write-after-write"""
+    last_writer = {}
+    readers_since_write = {}
+    for stage in stages:
+        for path in stage.inputs:
+            if path in last_writer:
+                stage.depends_on.add(last_writer[path])
+        for path in stage.outputs:
+            if path in last_writer:
+                stage.depends_on.add(last_writer[path])
+            stage.depends_on.update(readers_since_write.get(path, ()))
+        for path in stage.inputs:
+            readers_since_write.setdefault(path, set()).add(stage.name)
+        for path in stage.outputs:
+            last_writer[path] = stage.name
+            readers_since_write[path] = set()
+        stage.depends_on.discard(stage.name)
+
+
+def file_digest(path):
+    """SHA-256 of a file, or of a database's schema and rows"""
+    if path.suffix == '.db':
+        return database_digest(path)
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def database_digest(path):
+    """Hash a database by content, like sqlite's dbhash
+
+    Raw bytes differ between WAL and rollback-journal mode (and before and
+    after a checkpoint) for the same data; schema and rows in key order do not.
+    """
+    digest = hashlib.sha256()
+    conn = sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+    tables = conn.execute('''
+        SELECT type, name, sql FROM sqlite_master
+        WHERE sql IS NOT NULL
+        ORDER BY type, name
+    ''').fetchall()
+    for kind, name, sql in tables:
+        digest.update(sql.encode())
+        if kind == 'table' and not name.startswith('sqlite_'):
+            for row in conn.execute(f'SELECT * FROM "{name}" NOT INDEXED'):
+                digest.update(repr(row).encode())
+    conn.close()
+    return digest.hexdigest()
+
+
+def fingerprint(stage):
+    digest = hashlib.sha256()
+    for path in [stage.script, stage.cwd] + stage.args + stage.sources:
+        digest.update(path.encode())
+        full = PROJECT_ROOT / path
+        if full.is_file():
+            digest.update(file_digest(full).encode())
+    return digest.hexdigest()
+
+
+def open_state_db():
+    conn = sqlite3.connect(STATE_DB_PATH, check_same_thread=False)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS stage_runs (
+            stage TEXT PRIMARY KEY,
+            fingerprint TEXT NOT NULL,
+            duration_seconds REAL,
+            finished_at TEXT
+        )
+    ''')
+    # Digest of each output as the last stage to write it left it
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS file_digests (
+            path TEXT PRIMARY KEY,
+            digest TEXT NOT NULL
+        )
+    ''')
+    conn.commit()
+    return conn
+
+
+def set_journal_mode(mode):
+    """Switch the project databases' journal mode (persistent per database file)"""
+    for path in WAL_DATABASES:
+        full = PROJECT_ROOT / path
+        if full.exists():
+            conn = sqlite3.connect(full)
+            conn.execute(f'PRAGMA journal_mode={mode}')
+            conn.close()
+
+
+def run_stage(stage):
+    """Run a stage's script in its expected working directory"""
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, str(PROJECT_ROOT / stage.script)] + stage.args,
+        cwd=PROJECT_ROOT / stage.cwd,
+        capture_output=True,
+        text=True
+    )
+    return result, time.perf_counter() - start
+
+
+def run_pipeline(selected=None, force=False, jobs=4):
+    """Run stale stages in dependency order, parallelising independent ones"""
+    resolve_dependencies(STAGES)
+    stages = {stage.name: stage for stage in STAGES}
+    wanted = set(selected or stages)
+
+    state = open_state_db()
+    recorded = dict(state.execute('SELECT stage, fingerprint FROM stage_runs'))
+    left_at = dict(state.execute('SELECT path, digest FROM file_digests'))
+
+    # In-place files changed since the pipeline last wrote them; stages that
+    # rewrite one later in this run add it too, so the rest of its chain reruns
+    dirty = {
+        path
+        for stage in STAGES for path in stage.in_place
+        if (PROJECT_ROOT / path).exists() and file_digest(PROJECT_ROOT / path) != left_at.get(path)
+    }
+
+    status = {}
+    running = {}
+    pending = [name for name in stages if name in wanted]
+
+    set_journal_mode('WAL')
+    try:
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            while pending or running:
+                for name in list(pending):
+                    stage = stages[name]
+                    deps = [d for d in stage.depends_on if d in wanted]
+                    if any(status.get(d) == 'failed' or status.get(d) == 'blocked' for d in deps):
+                        status[name] = 'blocked'
+                        pending.remove(name)
+                        print(f"⏭️  {name}: blocked by failed dependency")
+                        continue
+                    if not all(d in status for d in deps):
+                        continue
+                    pending.remove(name)
+
+                    missing = [p for p in stage.inputs if not (PROJECT_ROOT / p).exists()]
+                    if missing:
+                        if all((PROJECT_ROOT / p).exists() for p in stage.outputs):
+                            status[name] = 'skipped'
+                            print(f"⏭️  {name}: source {missing[0]} missing, keeping existing outputs")
+                        else:
+                            status[name] = 'failed'
+                            print(f"❌ {name}: missing input {missing[0]}")
+                        continue
+
+                    # Taken before the run, so changes made while it runs mark it stale
+                    current = fingerprint(stage)
+                    outputs_present = all((PROJECT_ROOT / p).exists() for p in stage.outputs)
+                    changed = [p for p in stage.in_place if p in dirty]
+                    if not force and outputs_present and not changed and recorded.get(name) == current:
+                        status[name] = 'up-to-date'
+                        print(f"✔️  {name}: up to date")
+                        continue
+
+                    print(f"▶️  {name}: running {stage.script}")
+                    running[pool.submit(run_stage, stage)] = (name, current)
+
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name, current = running.pop(future)
+                    result, duration = future.result()
+                    if result.returncode != 0:
+                        status[name] = 'failed'
+                        print(f"❌ {name}: exit code {result.returncode}")
+                        print(result.stdout + result.stderr)
+                        continue
+                    status[name] = 'ran'
+                    state.execute('''
+                        INSERT OR REPLACE INTO stage_runs (stage, fingerprint, duration_seconds, finished_at)
+                        VALUES (?, ?, ?, ?)
+                    ''', (name, current, duration, datetime.now().isoformat()))
+                    for path in stages[name].outputs:
+                        if (PROJECT_ROOT / path).is_file():
+                            state.execute('INSERT OR REPLACE INTO file_digests (path, digest) VALUES (?, ?)',
+                                          (path, file_digest(PROJECT_ROOT / path)))
+                    dirty.update(stages[name].in_place)
+                    state.commit()
+                    print(f"✅ {name}: done in {duration:.1f}s")
+    finally:
+        # Back to a rollback journal: checkpoints and removes the -wal files and
+        # leaves the tracked database headers as they were before the run
+        set_journal_mode('DELETE')
+        state.close()
+
+    print(f"\n=== Pipeline Complete ===")
+    for label in ('ran', 'up-to-date', 'skipped', 'failed', 'blocked'):
+        names = [n for n in stages if status.get(n) == label]
+        if names:
+            print(f"{label}: {', '.join(names)}")
+
+    return not any(s in ('failed', 'blocked') for s in status.values())
+
+
+def list_stages():
+    resolve_dependencies(STAGES)
+    for stage in STAGES:
+        deps = ', '.join(sorted(stage.depends_on)) or '-'
+        print(f"{stage.name:16} cwd={stage.cwd:16} after: {deps}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Rebuild temple data incrementally')
+    parser.add_argument('stages', nargs='*', help='stages to run (default: all)')
+    parser.add_argument('--force', action='store_true', help='ignore fingerprints and rerun')
+    parser.add_argument('--jobs', type=int, default=4, help='maximum parallel stages')
+    parser.add_argument('--list', action='store_true', help='show stages and dependencies')
+    args = parser.parse_args()
+
+    if args.list:
+        list_stages()
+        sys.exit(0)
+
+    unknown = [s for s in args.stages if s not in {stage.name for stage in STAGES}]
+    if unknown:
+        print(f"Error: unknown stage {unknown[0]}")
+        sys.exit(1)
+
+    success = run_pipeline(args.stages, force=args.force, jobs=args.jobs)
+    sys.exit(0 if success else 1)
@@ -0,0 +1,462 @@
+#!/usr/bin/env python3
+"""
+Offline road-network travel times between temples from a local OSM extract
+
+Builds a compact road graph from an OpenStreetMap XML extract (.osm, .osm.gz
+or .osm.bz2 - convert .pbf with `osmium cat tamil-nadu.osm.pbf -o tn.osm`),
+preprocesses ALT landmarks for fast A* point-to-point queries, and caches a
+temple-to-temple travel time matrix in temple_app_mvp.db so circuit and
+nearby features no longer rely on straight-line haversine distances.
+
+Usage:
+    python3 utils/road_network.py build <extract.osm>   # build graph + matrix
+    python3 utils/road_network.py query <from_id> <to_id>
+"""
+
+import bz2
+import gzip
+import heapq
+import math
+import pickle
+import sqlite3
+import sys
+import time
+import xml.etree.ElementTree as ET
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+
+# Get project root
+PROJECT_ROOT = Path(__file__).parent.parent
+
+DB_PATH = PROJECT_ROOT / 'project-data' / 'database' / 'temple_app_mvp.db'
+GRAPH_PATH = PROJECT_ROOT / 'project-data' / 'road_graph.pickle'
+
+# Typical free-flow speeds (km/h) on Tamil Nadu roads by OSM highway class
+HIGHWAY_SPEEDS = {
+    'motorway': 90, 'motorway_link': 50,
+    'trunk': 70, 'trunk_link': 40,
+    'primary': 55, 'primary_link': 35,
+    'secondary': 45, 'secondary_link': 30,
+    'tertiary': 35, 'tertiary_link': 25,
+    'unclassified': 30, 'residential': 20,
+    'living_street': 10, 'service': 15, 'road': 25,
+}
+
+NUM_LANDMARKS = 16
+INFINITY = float('inf')
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Straight-line distance in km (same formula as calculateDistance in the prototype)"""
+    r = 6371
+    d_lat = math.radians(lat2 - lat1)
+    d_lon = math.radians(lon2 - lon1)
+    a = (math.sin(d_lat / 2) ** 2 +
+         math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) *
+         math.sin(d_lon / 2) ** 2)
+    return r * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+
+def _open_extract(path):
+    path = Path(path)
+    if path.suffix == '.gz':
+        return gzip.open(path, 'rb')
+    if path.suffix == '.bz2':
+        return bz2.open(path, 'rb')
+    return open(path, 'rb')
+
+
+def _iter_osm(extract_path, tag):
+    """Yield each finished <tag> element of an extract, keeping memory flat"""
+    with _open_extract(extract_path) as f:
+        root = None
+        for event, elem in ET.iterparse(f, events=('start', 'end')):
+            if root is None:
+                root = elem
+            if event == 'start' or elem.tag not in ('node', 'way', 'relation'):
+                continue
+            if elem.tag == tag:
+                yield elem
+            # Drop finished top-level elements so the tree never grows with the extract
+            root.clear()
+
+
+class RoadGraph:
+    """Road graph in compressed sparse row form with ALT landmark distances"""
+
+    def __init__(self, lats, lons, offsets, targets, seconds, meters):
+        self.lats = lats
+        self.lons = lons
+        self.offsets = offsets
+        self.targets = targets
+        self.seconds = seconds
+        self.meters = meters
+        self.landmarks = []
+        self.landmark_from = []  # landmark -> node travel seconds
+        self.landmark_to = []    # node -> landmark travel seconds
+        self._grid = None
+
+    @property
+    def node_count(self):
+        return len(self.lats)
+
+    @classmethod
+    def from_osm(cls, extract_path):
+        """Parse highway ways from an OSM XML extract into a routable graph
+
+        Two passes over the extract: the first keeps routable ways and the ids
+        of the nodes they use, the second stores coordinates for those nodes
+        only, in flat arrays indexed by position in the sorted id list, so the
+        (far more numerous) untagged and off-road nodes cost nothing.
+        """
+        ways = []
+        for elem in _iter_osm(extract_path, 'way'):
+            tags = {tag.get('k'): tag.get('v') for tag in elem.iter('tag')}
+            highway = tags.get('highway')
+            if highway in HIGHWAY_SPEEDS and tags.get('access') not in ('no', 'private'):
+                # oneway=-1 is one-way against the node order; the nodes are reversed below
+                reverse = tags.get('oneway') == '-1'
+                oneway = (reverse or tags.get('oneway') in ('yes', '1', 'true')
+                          or highway.startswith('motorway'))
+                speed = _parse_maxspeed(tags.get('maxspeed')) or HIGHWAY_SPEEDS[highway]
+                nodes = array('q', (int(nd.get('ref')) for nd in elem.iter('nd')))
+                ways.append((nodes[::-1] if reverse else nodes, speed, oneway))
+
+        ids = array('q')
+        for osm_id in sorted(osm_id for nodes, _, _ in ways for osm_id in nodes):
+            if not ids or ids[-1] != osm_id:
+                ids.append(osm_id)
+
+        # NaN marks way nodes missing from the extract (e.g. clipped at its border)
+        node_lats = array('d', [math.nan]) * len(ids)
+        node_lons = array('d', [math.nan]) * len(ids)
+        for elem in _iter_osm(extract_path, 'node'):
+            osm_id = int(elem.get('id'))
+            pos = bisect_left(ids, osm_id)
+            if pos < len(ids) and ids[pos] == osm_id:
+                node_lats[pos] = float(elem.get('lat'))
+                node_lons[pos] = float(elem.get('lon'))
+
+        # Renumber the nodes that lie on a routable way densely, in way order
+        dense = array('l', [-1]) * len(ids)
+        lats = array('d')
+        lons = array('d')
+        edges = []
+        for nodes, speed, oneway in ways:
+            prev = None
+            for osm_id in nodes:
+                pos = bisect_left(ids, osm_id)
+                if math.isnan(node_lats[pos]):
+                    prev = None
+                    continue
+                if dense[pos] < 0:
+                    dense[pos] = len(lats)
+                    lats.append(node_lats[pos])
+                    lons.append(node_lons[pos])
+                node = dense[pos]
+                if prev is not None and prev != node:
+                    km = haversine_km(lats[prev], lons[prev], lats[node], lons[node])
+                    secs = km / speed * 3600
+                    edges.append((prev, node, secs, km * 1000))
+                    if not oneway:
+                        edges.append((node, prev, secs, km * 1000))
+                prev = node
+
+        return cls.from_edges(lats, lons, edges)
+
+    @classmethod
+    def from_edges(cls, lats, lons, edges):
+        """Pack (source, target, seconds, metres) tuples into CSR arrays"""
+        edges.sort()
+        offsets = array('l', [0] * (len(lats) + 1))
+        targets = array('l')
+        seconds = array('f')
+        meters = array('f')
+        for source, target, secs, dist in edges:
+            offsets[source + 1] += 1
+            targets.append(target)
+            seconds.append(secs)
+            meters.append(dist)
+        for i in range(len(lats)):
+            offsets[i + 1] += offsets[i]
+        return cls(lats, lons, offsets, targets, seconds, meters)
+
+    def reversed(self):
+        """Graph with every edge flipped (used for node -> landmark distances)"""
+        edges = []
+        for source in range(self.node_count):
+            for e in range(self.offsets[source], self.offsets[source + 1]):
+                edges.append((self.targets[e], source, self.seconds[e], self.meters[e]))
+        return RoadGraph.from_edges(self.lats, self.lons, edges)
+
+    def dijkstra(self, source, targets=None):
+        """Travel seconds and metres from source; stops early once all targets are settled"""
+        dist = {source: 0.0}
+        meters = {source: 0.0}
+        remaining = set(targets) if targets is not None else None
+        heap = [(0.0, source)]
+        settled = set()
+        while heap:
+            d, node = heapq.heappop(heap)
+            if node in settled:
+                continue
+            settled.add(node)
+            if remaining is not None:
+                remaining.discard(node)
+                if not remaining:
+                    break
+            for e in range(self.offsets[node], self.offsets[node + 1]):
+                target = self.targets[e]
+                nd = d + self.seconds[e]
+                if nd < dist.get(target, INFINITY):
+                    dist[target] = nd
+                    meters[target] = meters[node] + self.meters[e]
+                    heapq.heappush(heap, (nd, target))
+        return dist, meters
+
+    def build_landmarks(self, count=NUM_LANDMARKS):
+        """Pick landmarks by farthest-point selection and store their distance tables"""
+        backward = self.reversed()
+        self.landmarks = []
+        self.landmark_from = []
+        self.landmark_to = []
+        current = 0
+        coverage = [INFINITY] * self.node_count
+        for _ in range(min(count, self.node_count)):
+            self.landmarks.append(current)
+            from_dist = self.dijkstra(current)[0]
+            to_dist = backward.dijkstra(current)[0]
+            self.landmark_from.append(_to_table(from_dist, self.node_count))
+            self.landmark_to.append(_to_table(to_dist, self.node_count))
+            best, current = -1.0, None
+            for node, d in from_dist.items():
+                coverage[node] = min(coverage[node], d)
+                if coverage[node] > best and node not in self.landmarks:
+                    best, current = coverage[node], node
+            if current is None:
+                break
+
+    def _lower_bound(self, node, target):
+        # Triangle inequality over landmarks: d(v,t) >= d(L,t) - d(L,v) and d(v,L) - d(t,L)
+        bound = 0.0
+        for from_l, to_l in zip(self.landmark_from, self.landmark_to):
+            a = from_l[target] - from_l[node]
+            b = to_l[node] - to_l[target]
+            if a > bound and from_l[node] < INFINITY:
+                bound = a
+            if b > bound and to_l[target] < INFINITY:
+                bound = b
+        return bound
+
+    def route(self, source, target):
+        """A* with landmark lower bounds; returns (seconds, meters) or None"""
+        g = {source: (0.0, 0.0)}
+        heap = [(self._lower_bound(source, target), source)]
+        settled = set()
+        while heap:
+            _, node = heapq.heappop(heap)
+            if node == target:
+                return g[node]
+            if node in settled:
+                continue
+            settled.add(node)
+            secs, dist = g[node]
+            for e in range(self.offsets[node], self.offsets[node + 1]):
+                nxt = self.targets[e]
+                ns = secs + self.seconds[e]
+                if ns < g.get(nxt, (INFINITY,))[0]:
+                    g[nxt] = (ns, dist + self.meters[e])
+                    heapq.heappush(heap, (ns + self._lower_bound(nxt, target), nxt))
+        return None
+
+    def nearest_node(self, lat, lon):
+        """Snap a coordinate to the closest graph node using a coarse grid index"""
+        if self._grid is None:
+            self._grid = {}
+            for i in range(self.node_count):
+                key = (int(self.lats[i] * 50), int(self.lons[i] * 50))
+                self._grid.setdefault(key, []).append(i)
+        cell = (int(lat * 50), int(lon * 50))
+        for radius in range(0, 26):
+            candidates = []
+            for dy in range(-radius, radius + 1):
+                for dx in range(-radius, radius + 1):
+                    if max(abs(dy), abs(dx)) == radius:
+                        candidates.extend(self._grid.get((cell[0] + dy, cell[1] + dx), ()))
+            if candidates:
+                return min(candidates, key=lambda i: haversine_km(lat, lon, self.lats[i], self.lons[i]))
+        return None
+
+    def save(self, path=GRAPH_PATH):
+        grid, self._grid = self._grid, None
+        with open(path, 'wb') as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+        self._grid = grid
+
+    @staticmethod
+    def load(path=GRAPH_PATH):
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+
+
+def _parse_maxspeed(value):
+    if not value:
+        return None
+    try:
+        speed = float(value.split()[0])
+    except ValueError:
+        return None
+    return speed * 1.609 if 'mph' in value else speed
+
+
+def _to_table(dist, size):
+    table = array('f', [INFINITY]) * size
+    for node, d in dist.items():
+        table[node] = d
+    return table
+
+
+def ensure_travel_times_table(conn):
+    """Create the cached temple-to-temple travel matrix table"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS travel_times (
+            from_temple_id TEXT NOT NULL,
+            to_temple_id TEXT NOT NULL,
+            travel_seconds REAL NOT NULL,
+            road_distance_km REAL NOT NULL,
+            PRIMARY KEY (from_temple_id, to_temple_id)
+        ) WITHOUT ROWID
+    ''')
+    # Nearest-first listing from one temple (temple_listing.list_nearby_temple)
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_travel_times_nearby
+        ON travel_times(from_temple_id, travel_seconds)
+    ''')
+
+
+def build_travel_matrix(graph, conn):
+    """Compute road travel times between all navigation-ready temples (many-to-many)"""
+    ensure_travel_times_table(conn)
+    temples = conn.execute('SELECT id, latitude, longitude FROM app_temples').fetchall()
+
+    snapped = {}
+    for temple_id, lat, lon in temples:
+        node = graph.nearest_node(lat, lon)
+        if node is not None:
+            snapped[temple_id] = node
+    nodes = set(snapped.values())
+
+    rows = []
+    for from_id, source in snapped.items():
+        # One truncated Dijkstra per source answers the whole row of the matrix
+        dist, meters = graph.dijkstra(source, targets=nodes)
+        for to_id, target in snapped.items():
+            if to_id != from_id and target in dist:
+                rows.append((from_id, to_id, dist[target], meters[target] / 1000))
+
+    conn.execute('DELETE FROM travel_times')
+    conn.executemany('INSERT INTO travel_times VALUES (?, ?, ?, ?)', rows)
+    conn.commit()
+    return len(snapped), len(rows)
+
+
+def travel_time(conn, from_id, to_id):
+    """Cached (seconds, km) between two temples, or None when not routable"""
+    return conn.execute('''
+        SELECT travel_seconds, road_distance_km FROM travel_times
+        WHERE from_temple_id = ? AND to_temple_id = ?
+    ''', (from_id, to_id)).fetchone()
+
+
+def update_circuit_totals(conn):
+    """Recompute tour_circuits distance/hours from road times along sequence_order"""
+    updated = 0
+    for (circuit_id,) in conn.execute('SELECT id FROM tour_circuits').fetchall():
+        stops = [row[0] for row in conn.execute('''
+            SELECT temple_id FROM circuit_temples
+            WHERE circuit_id = ? ORDER BY sequence_order
+        ''', (circuit_id,))]
+        legs = [travel_time(conn, a, b) for a, b in zip(stops, stops[1:])]
+        if not legs or any(leg is None for leg in legs):
+            continue
+        conn.execute('''
+            UPDATE tour_circuits SET total_distance_km = ?, estimated_hours = ?
+            WHERE id = ?
+        ''', (
+            round(sum(km for _, km in legs), 1),
+            round(sum(secs for secs, _ in legs) / 3600, 1),
+            circuit_id
+        ))
+        updated += 1
+    conn.commit()
+    return updated
+
+
+def build(extract_path):
+    print(f"🗺️  Loading road network from {extract_path}...")
+    start = time.perf_counter()
+    graph = RoadGraph.from_osm(extract_path)
+    print(f"   {graph.node_count} nodes, {len(graph.targets)} edges "
+          f"({time.perf_counter() - start:.1f}s)")
+
+    start = time.perf_counter()
+    graph.build_landmarks()
+    print(f"   {len(graph.landmarks)} landmarks ({time.perf_counter() - start:.1f}s)")
+    graph.save()
+
+    conn = sqlite3.connect(DB_PATH)
+    start = time.perf_counter()
+    temples, pairs = build_travel_matrix(graph, conn)
+    circuits = update_circuit_totals(conn)
+    conn.close()
+
+    print(f"\n✅ Cached {pairs} travel times for {temples} temples "
+          f"({time.perf_counter() - start:.1f}s)")
+    print(f"   Updated {circuits} tour circuits with road distances")
+    print(f"📁 Graph saved to: {GRAPH_PATH}")
+
+
+def query(from_id, to_id):
+    conn = sqlite3.connect(DB_PATH)
+    cached = None
+    try:
+        cached = travel_time(conn, from_id, to_id)
+    except sqlite3.OperationalError:
+        pass
+    if cached:
+        print(f"{from_id} -> {to_id}: {cached[0] / 60:.0f} min, {cached[1]:.1f} km (cached)")
+        conn.close()
+        return True
+
+    coords = dict((row[0], row[1:]) for row in conn.execute(
+        'SELECT id, latitude, longitude FROM app_temples WHERE id IN (?, ?)', (from_id, to_id)))
+    conn.close()
+    if len(coords) != 2 or not GRAPH_PATH.exists():
+        print("Error: unknown temple or road graph not built")
+        return False
+
+    graph = RoadGraph.load()
+    start = time.perf_counter()
+    source = graph.nearest_node(*coords[from_id])
+    target = graph.nearest_node(*coords[to_id])
+    if source is None or target is None:
+        print(f"{from_id if source is None else to_id} is not near any road in the extract")
+        return False
+    result = graph.route(source, target)
+    elapsed = (time.perf_counter() - start) * 1000
+    if result is None:
+        print(f"No road route between {from_id} and {to_id}")
+        return False
+    print(f"{from_id} -> {to_id}: {result[0] / 60:.0f} min, {result[1] / 1000:.1f} km ({elapsed:.1f} ms)")
+    return True
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == 'build':
+        build(sys.argv[2])
+    elif len(sys.argv) == 4 and sys.argv[1] == 'query':
+        sys.exit(0 if query(sys.argv[2], sys.argv[3]) else 1)
+    else:
+        print(__doc__)
+        sys.exit(1)
@@ -9,14 +9,55 @@ import sqlite3
 import sys
 from pathlib import Path
 
+from json_stream import batched, iter_temples
+
 # Get project root
 PROJECT_ROOT = Path(__file__).parent.parent
 
-def sync_json_to_database():
-    """Sync enriched temple data from JSON to SQLite database"""
+# Temples written per transaction; bounds memory for multi-hundred-MB feeds
+BATCH_SIZE = 500
+
+def has_enrichment(temple):
+    """Check if temple has enrichment data"""
+    return any([
+        temple.get('timings'),
+        temple.get('festivals'),
+        temple.get('special_features'),
+        temple.get('holy_water'),
+        temple.get('sacred_tree'),
+        temple.get('history'),
+        temple.get('prayer_benefits'),
+        temple.get('other_deities'),
+        temple.get('architecture'),
+        temple.get('how_to_reach')
+    ])
+
+def enrichment_values(temple):
+    """Enrichment columns in UPDATE order (temple_id last)"""
+    # Prepare prayer_benefits as part of special_features if it exists
+    special_features = temple.get('special_features', [])
+    if temple.get('prayer_benefits'):
+        # Add prayer benefits to special features with a header
+        special_features = special_features + ['Prayer Benefits:'] + temple.get('prayer_benefits', [])
+    
+    return (
+        temple.get('timings'),
+        json.dumps(temple.get('festivals', []), ensure_ascii=False),
+        json.dumps(special_features, ensure_ascii=False),
+        json.dumps(temple.get('holy_water', []), ensure_ascii=False),
+        temple.get('sacred_tree'),
+        temple.get('history'),
+        temple.get('how_to_reach'),
+        json.dumps(temple.get('other_deities', []), ensure_ascii=False),
+        temple.get('deity_main'),
+        temple['id']
+    )
+
+def sync_json_to_database(json_path=None):
+    """Sync enriched temple data from JSON (or NDJSON) to SQLite database"""
     
     # Paths
-    json_path = PROJECT_ROOT / 'design' / 'mockups' / 'temple_data.json'
+    json_path = Path(json_path) if json_path else PROJECT_ROOT / 'design' / 'mockups' / 'temple_data.json'
     db_path = PROJECT_ROOT / 'project-data' / 'database' / 'app_temples_unified.db'
     
     if not json_path.exists():
@@ -27,106 +68,67 @@ def sync_json_to_database():
         print(f"Error: Database not found at {db_path}")
         return False
     
-    # Load JSON data
-    with open(json_path, 'r', encoding='utf-8') as f:
-        json_data = json.load(f)
-    
     # Connect to database
     conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
     
     temples_updated = 0
     temples_inserted = 0
+    temples_seen = 0
     
-    # Process each temple
-    for temple in json_data['app_temples']:
-        # Check if temple has enrichment data
-        has_enrichment = any([
-            temple.get('timings'),
-            temple.get('festivals'),
-            temple.get('special_features'),
-            temple.get('holy_water'),
-            temple.get('sacred_tree'),
-            temple.get('history'),
-            temple.get('prayer_benefits'),
-            temple.get('other_deities'),
-            temple.get('architecture'),
-            temple.get('how_to_reach')
-        ])
+    # Stream temples from the feed and write them in batched transactions
+    for batch in batched(iter_temples(json_path), BATCH_SIZE):
+        # Later duplicates of a temple win, as they did with per-row upserts
+        enriched = list({t['id']: t for t in batch if has_enrichment(t)}.values())
         
-        if has_enrichment:
-            # Check if enrichment exists
-            cursor.execute('SELECT temple_id FROM temple_enrichments WHERE temple_id = ?', (temple['id'],))
-            exists = cursor.fetchone()
-            
-            # Prepare prayer_benefits as part of special_features if it exists
-            special_features = temple.get('special_features', [])
-            if temple.get('prayer_benefits'):
-                # Add prayer benefits to special features with a header
-                special_features = special_features + ['Prayer Benefits:'] + temple.get('prayer_benefits', [])
-            
-            if exists:
-                # Update existing enrichment
-                cursor.execute('''
-                    UPDATE temple_enrichments 
-                    SET timings = ?,
-                        festivals = ?,
-                        special_features = ?,
-                        holy_water = ?,
-                        sacred_tree = ?,
-                        historical_info = ?,
-                        how_to_reach = ?,
-                        deity_others = ?,
-                        deity_main = ?
-                    WHERE temple_id = ?
-                ''', (
-                    temple.get('timings'),
-                    json.dumps(temple.get('festivals', []), ensure_ascii=False),
-                    json.dumps(special_features, ensure_ascii=False),
-                    json.dumps(temple.get('holy_water', []), ensure_ascii=False),
-                    temple.get('sacred_tree'),
-                    temple.get('history'),
-                    temple.get('how_to_reach'),
-                    json.dumps(temple.get('other_deities', []), ensure_ascii=False),
-                    temple.get('deity_main'),
-                    temple['id']
-                ))
-                temples_updated += 1
-                print(f"Updated: {temple['name']}")
-            else:
-                # Insert new enrichment
-                cursor.execute('''
-                    INSERT INTO temple_enrichments 
-                    (temple_id, timings, festivals, special_features, holy_water, 
-                     sacred_tree, historical_info, how_to_reach, deity_others, deity_main)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    temple['id'],
-                    temple.get('timings'),
-                    json.dumps(temple.get('festivals', []), ensure_ascii=False),
-                    json.dumps(special_features, ensure_ascii=False),
-                    json.dumps(temple.get('holy_water', []), ensure_ascii=False),
-                    temple.get('sacred_tree'),
-                    temple.get('history'),
-                    temple.get('how_to_reach'),
-                    json.dumps(temple.get('other_deities', []), ensure_ascii=False),
-                    temple.get('deity_main')
-                ))
-                temples_inserted += 1
-                print(f"Inserted: {temple['name']}")
+        # Check which enrichments already exist
+        existing = set()
+        if enriched:
+            placeholders = ', '.join('?' * len(enriched))
+            cursor.execute(
+                f'SELECT temple_id FROM temple_enrichments WHERE temple_id IN ({placeholders})',
+                [temple['id'] for temple in enriched]
+            )
+            existing = {row[0] for row in cursor.fetchall()}
+        
+        updates = [enrichment_values(t) for t in enriched if t['id'] in existing]
+        inserts = [enrichment_values(t) for t in enriched if t['id'] not in existing]
+        
+        # Update existing enrichment
+        cursor.executemany('''
+            UPDATE temple_enrichments 
+            SET timings = ?,
+                festivals = ?,
+                special_features = ?,
+                holy_water = ?,
+                sacred_tree = ?,
+                historical_info = ?,
+                how_to_reach = ?,
+                deity_others = ?,
+                deity_main = ?
+            WHERE temple_id = ?
+        ''', updates)
+        
+        # Insert new enrichment
+        cursor.executemany('''
+            INSERT INTO temple_enrichments 
+            (timings, festivals, special_features, holy_water, sacred_tree,
+             historical_info, how_to_reach, deity_others, deity_main, temple_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', inserts)
         
         # Update main temples table with GPS and other data
-        if temple.get('latitude') and temple.get('longitude'):
-            cursor.execute('''
-                UPDATE temples 
-                SET latitude = ?, 
-                    longitude = ?,
-                    gm_rating = ?,
-                    gm_phone = ?,
-                    gm_website = ?,
-                    gm_popular_times = ?
-                WHERE id = ?
-            ''', (
+        cursor.executemany('''
+            UPDATE temples 
+            SET latitude = ?, 
+                longitude = ?,
+                gm_rating = ?,
+                gm_phone = ?,
+                gm_website = ?,
+                gm_popular_times = ?
+            WHERE id = ?
+        ''', [
+            (
                 temple.get('latitude'),
                 temple.get('longitude'),
                 temple.get('gm_rating'),
@@ -134,10 +136,17 @@ def sync_json_to_database():
                 temple.get('gm_website'),
                 json.dumps(temple.get('popular_times', []), ensure_ascii=False),
                 temple['id']
-            ))
-    
-    # Commit changes
-    conn.commit()
+            )
+            for temple in batch
+            if temple.get('latitude') and temple.get('longitude')
+        ])
+        
+        conn.commit()
+        
+        temples_updated += len(updates)
+        temples_inserted += len(inserts)
+        temples_seen += len(batch)
+        print(f"Synced {temples_seen} temples ({len(updates)} updated, {len(inserts)} inserted in batch)")
     
     # Get statistics
     cursor.execute('SELECT COUNT(*) FROM temple_enrichments')
@@ -157,5 +166,5 @@ def sync_json_to_database():
     return True
 
 if __name__ == "__main__":
-    success = sync_json_to_database()
+    success = sync_json_to_database(sys.argv[1] if len(sys.argv) > 1 else None)
     sys.exit(0 if success else 1)
\ No newline at end of file
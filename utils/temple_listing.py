@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Keyset-paginated listings for the temple directory and discovery screens
+
+Each page is a single bounded query that resumes after the last row of the
+previous page (an opaque cursor) instead of re-sorting the full list and
+slicing it, so memory stays flat however large the directory grows:
+
+    list_directory()     - temple_directory ordered by (district, name)
+    list_by_rating()     - app_temples ordered by gm_rating (unrated last)
+    list_nearby()        - app_temples ordered by distance from a point
+    list_nearby_temple() - app_temples ordered by road travel time from a temple
+
+list_by_rating() and the nearby listings take an optional deity_type filter
+for the discovery screen. The functions never write: the indexes they rely on are
+created by `--create-indexes` (the pipeline's listing_indexes stage).
+
+Usage:
+    python3 utils/temple_listing.py --create-indexes
+    python3 utils/temple_listing.py directory [cursor]
+    python3 utils/temple_listing.py nearby <lat> <lon> [cursor]
+    python3 utils/temple_listing.py nearby-temple <temple_id> [cursor]
+"""
+
+import base64
+import json
+import math
+import sqlite3
+import sys
+from pathlib import Path
+
+from road_network import haversine_km
+
+# Get project root
+PROJECT_ROOT = Path(__file__).parent.parent
+
+DB_PATH = PROJECT_ROOT / 'project-data' / 'database' / 'temple_app_mvp.db'
+
+PAGE_SIZE = 50
+KM_PER_DEGREE_LAT = 111.32
+
+# Composite indexes matching each listing's sort key exactly
+LISTING_INDEXES = [
+    'CREATE INDEX IF NOT EXISTS idx_directory_district_name ON temple_directory(district, name, id)',
+    'CREATE INDEX IF NOT EXISTS idx_app_temples_rating_id ON app_temples(COALESCE(gm_rating, 0) DESC, id)',
+    '''CREATE INDEX IF NOT EXISTS idx_app_temples_deity_rating_id
+       ON app_temples(deity_type, COALESCE(gm_rating, 0) DESC, id)''',
+]
+# list_nearby uses the existing idx_app_temples_location (latitude, longitude).
+# The indexes are created at build time (pipeline listing_indexes stage,
+# build_mobile_db.py); the list_* functions only read.
+
+DIRECTORY_COLUMNS = 'id, name, tamil_name, district, navigation_available, deity_type'
+TEMPLE_COLUMNS = 'id, name, tamil_name, district, latitude, longitude, deity_type, gm_rating'
+
+
+def ensure_listing_indexes(conn):
+    """Create the composite indexes the keyset queries rely on (no-op once they exist)"""
+    for statement in LISTING_INDEXES:
+        conn.execute(statement)
+    conn.commit()
+
+
+def encode_cursor(key):
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode()
+
+
+def decode_cursor(cursor):
+    return json.loads(base64.urlsafe_b64decode(cursor.encode()))
+
+
+def _fetch(conn, sql, params):
+    """Run a listing query with Row results, leaving conn.row_factory alone"""
+    cursor = conn.cursor()
+    cursor.row_factory = sqlite3.Row
+    return cursor.execute(sql, params).fetchall()
+
+
+def _page(rows, limit, key):
+    """Split one extra row off to decide whether a next cursor is needed"""
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = encode_cursor(key(rows[-1])) if has_more and rows else None
+    return [dict(row) for row in rows], next_cursor
+
+
+def list_directory(conn, cursor=None, limit=PAGE_SIZE, district=None):
+    """One page of temple_directory in (district, name) order"""
+    params = []
+    where = []
+    if district:
+        where.append('district = ?')
+        params.append(district)
+    if cursor:
+        last_district, last_name, last_id = decode_cursor(cursor)
+        where.append('(district, name, id) > (?, ?, ?)')
+        params.extend([last_district, last_name, last_id])
+
+    rows = _fetch(conn, f'''
+        SELECT {DIRECTORY_COLUMNS}
+        FROM temple_directory
+        {'WHERE ' + ' AND '.join(where) if where else ''}
+        ORDER BY district, name, id
+        LIMIT ?
+    ''', params + [limit + 1])
+
+    return _page(rows, limit, lambda r: [r['district'], r['name'], r['id']])
+
+
+def list_by_rating(conn, cursor=None, limit=PAGE_SIZE, deity_type=None):
+    """One page of app_temples by rating, highest first, unrated temples last"""
+    params = []
+    where = []
+    if deity_type:
+        where.append('deity_type = ?')
+        params.append(deity_type)
+    if cursor:
+        last_rating, last_id = decode_cursor(cursor)
+        # The leading <= bound keeps the scan a single index range
+        where.append('''COALESCE(gm_rating, 0) <= ?
+                     AND (COALESCE(gm_rating, 0) < ? OR id > ?)''')
+        params.extend([last_rating, last_rating, last_id])
+
+    rows = _fetch(conn, f'''
+        SELECT {TEMPLE_COLUMNS}
+        FROM app_temples
+        {'WHERE ' + ' AND '.join(where) if where else ''}
+        ORDER BY COALESCE(gm_rating, 0) DESC, id
+        LIMIT ?
+    ''', params + [limit + 1])
+
+    return _page(rows, limit, lambda r: [r['gm_rating'] or 0, r['id']])
+
+
+def _distance_km(lat1, lon1, lat2, lon2):
+    # Rounded so SQL comparisons match the distances stored in cursors exactly
+    return round(haversine_km(lat1, lon1, lat2, lon2), 6)
+
+
+def list_nearby(conn, lat, lon, cursor=None, limit=PAGE_SIZE, radius_km=10, deity_type=None):
+    """One page of app_temples ordered by distance from (lat, lon)
+
+    Distance cannot be indexed directly, so each page range-scans a bounding
+    box on the (latitude, longitude) index, widening it until the box's
+    inscribed circle holds a full page past the cursor. Distance, the cursor
+    bound and the page limit are applied in SQL, so at most limit + 1 rows are
+    loaded per query. The cursor carries the search radius and the radius
+    covering every temple, so later pages start from where the last one
+    stopped and the table bounds are only read once.
+    """
+    conn.create_function('distance_km', 4, _distance_km, deterministic=True)
+    deity_filter = 'AND deity_type = ?' if deity_type else ''
+
+    if cursor:
+        last_distance, last_id, radius, max_radius = decode_cursor(cursor)
+    else:
+        min_lat, max_lat, min_lon, max_lon = conn.execute(
+            'SELECT MIN(latitude), MAX(latitude), MIN(longitude), MAX(longitude) FROM app_temples'
+        ).fetchone()
+        if min_lat is None:
+            return [], None
+        last_distance, last_id, radius = -1.0, '', radius_km
+        # Beyond this radius the circle already contains every temple
+        max_radius = max(haversine_km(lat, lon, corner_lat, corner_lon)
+                         for corner_lat in (min_lat, max_lat)
+                         for corner_lon in (min_lon, max_lon))
+
+    while True:
+        d_lat = radius / KM_PER_DEGREE_LAT
+        d_lon = radius / (KM_PER_DEGREE_LAT * max(math.cos(math.radians(lat)), 0.01))
+        rows = _fetch(conn, f'''
+            SELECT * FROM (
+                SELECT {TEMPLE_COLUMNS}, distance_km(?, ?, latitude, longitude) AS distance_km
+                FROM app_temples
+                WHERE latitude BETWEEN ? AND ?
+                  AND longitude BETWEEN ? AND ?
+                  {deity_filter}
+            )
+            WHERE distance_km <= ? AND (distance_km, id) > (?, ?)
+            ORDER BY distance_km, id
+            LIMIT ?
+        ''', [lat, lon, lat - d_lat, lat + d_lat, lon - d_lon, lon + d_lon]
+            + ([deity_type] if deity_type else [])
+            + [radius, last_distance, last_id, limit + 1])
+
+        if len(rows) > limit or radius >= max_radius:
+            break
+        radius *= 2
+
+    return _page(rows, limit, lambda r: [r['distance_km'], r['id'], radius, max_radius])
+
+
+def list_nearby_temple(conn, temple_id, cursor=None, limit=PAGE_SIZE, deity_type=None):
+    """One page of app_temples nearest to temple_id by road travel time
+
+    Reads the travel_times matrix cached by road_network.py, paging on
+    (travel_seconds, id) along idx_travel_times_nearby. When the temple has
+    no matrix row (no extract built yet, or it did not snap to a road) this
+    falls back to list_nearby() from the temple's coordinates, leaving the
+    temple itself out of the page.
+    """
+    has_matrix = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'travel_times'"
+    ).fetchone() and conn.execute(
+        'SELECT 1 FROM travel_times WHERE from_temple_id = ? LIMIT 1', (temple_id,)
+    ).fetchone()
+
+    if not has_matrix:
+        origin = conn.execute(
+            'SELECT latitude, longitude FROM app_temples WHERE id = ?', (temple_id,)
+        ).fetchone()
+        if origin is None:
+            return [], None
+        rows, next_cursor = list_nearby(conn, *origin, cursor=cursor, limit=limit, deity_type=deity_type)
+        return [row for row in rows if row['id'] != temple_id], next_cursor
+
+    params = [temple_id]
+    where = ['tt.from_temple_id = ?']
+    if deity_type:
+        where.append('t.deity_type = ?')
+        params.append(deity_type)
+    if cursor:
+        last_seconds, last_id = decode_cursor(cursor)
+        where.append('(tt.travel_seconds, tt.to_temple_id) > (?, ?)')
+        params.extend([last_seconds, last_id])
+
+    columns = ', '.join('t.' + column for column in TEMPLE_COLUMNS.split(', '))
+    rows = _fetch(conn, f'''
+        SELECT {columns}, tt.travel_seconds, tt.road_distance_km
+        FROM travel_times tt
+        JOIN app_temples t ON t.id = tt.to_temple_id
+        WHERE {' AND '.join(where)}
+        ORDER BY tt.travel_seconds, tt.to_temple_id
+        LIMIT ?
+    ''', params + [limit + 1])
+
+    return _page(rows, limit, lambda r: [r['travel_seconds'], r['id']])
+
+
+def iter_pages(list_fn, conn, *args, **kwargs):
+    """Yield successive pages from one of the list_* functions"""
+    cursor = None
+    while True:
+        rows, cursor = list_fn(conn, *args, cursor=cursor, **kwargs)
+        yield rows
+        if not cursor:
+            break
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if args[:1] == ['--create-indexes']:
+        conn = sqlite3.connect(DB_PATH)
+    else:
+        conn = sqlite3.connect(f'file:{DB_PATH}?mode=ro', uri=True)
+
+    if args[:1] == ['--create-indexes']:
+        ensure_listing_indexes(conn)
+        print(f"✅ Created {len(LISTING_INDEXES)} listing indexes")
+    elif args[:1] == ['directory']:
+        rows, next_cursor = list_directory(conn, *args[1:2])
+        for row in rows:
+            print(f"{row['district']:30} {row['name']}")
+        print(f"\nnext: {next_cursor}")
+    elif args[:1] == ['nearby'] and len(args) >= 3:
+        rows, next_cursor = list_nearby(conn, float(args[1]), float(args[2]), *args[3:4])
+        for row in rows:
+            print(f"{row['distance_km']:8.1f} km  {row['name']}")
+        print(f"\nnext: {next_cursor}")
+    elif args[:1] == ['nearby-temple'] and len(args) >= 2:
+        rows, next_cursor = list_nearby_temple(conn, args[1], *args[2:3])
+        for row in rows:
+            if 'travel_seconds' in row:
+                print(f"{row['travel_seconds'] / 60:6.0f} min  {row['road_distance_km']:6.1f} km  {row['name']}")
+            else:
+                print(f"{row['distance_km']:8.1f} km  {row['name']}")
+        print(f"\nnext: {next_cursor}")
+    else:
+        print(__doc__)
+        sys.exit(1)
+
+    conn.close()
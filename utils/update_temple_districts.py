@@ -3,9 +3,10 @@
 Update temple districts for temples currently showing 'Tamil Nadu' as district
 """
 
-import json
 from pathlib import Path
 
+from json_stream import rewrite_json_stream
+
 # Get project root
 PROJECT_ROOT = Path(__file__).parent.parent
 
@@ -108,16 +109,12 @@ TEMPLE_DISTRICTS = {
 def update_temple_districts():
     """Update temple districts in JSON file"""
     
-    # Load JSON data
     json_path = PROJECT_ROOT / 'design' / 'mockups' / 'temple_data.json'
     
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
     updated_count = 0
     
-    # Update temples
-    for temple in data['app_temples']:
+    def update_temple(temple):
+        nonlocal updated_count
         if temple['id'] in TEMPLE_DISTRICTS:
             updates = TEMPLE_DISTRICTS[temple['id']]
             
@@ -136,10 +133,10 @@ def update_temple_districts():
             print(f"Updated {temple['id']}: {temple['name']}")
             print(f"  District: {old_district} -> {updates['district']}")
             updated_count += 1
+        return temple
     
-    # Save updated JSON
-    with open(json_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    # Stream temples through the update and write the JSON back one record at a time
+    rewrite_json_stream(json_path, update_temple)
     
     print(f"\n✅ Updated {updated_count} temples with correct districts")
     return updated_count
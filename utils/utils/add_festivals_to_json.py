@@ -4,16 +4,17 @@ Add festival data to temple_data.json for the HTML app
 """
 
 import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from json_stream import rewrite_json_stream
 
 def add_festivals_to_json():
     """Add festival data to temple_data.json"""
     
     print("📅 Adding festivals to temple_data.json...")
     
-    # Load existing temple data
-    with open('../design/mockups/temple_data.json', 'r') as f:
-        temple_data = json.load(f)
-    
     # Load festival data
     with open('../project-data/festivals_2025_complete.json', 'r') as f:
         festival_data = json.load(f)
@@ -83,11 +84,8 @@ def add_festivals_to_json():
     # Sort by date
     all_festivals.sort(key=lambda x: x['date'])
     
-    # Add festivals to temple data
-    temple_data['festivals'] = all_festivals
-    
     # Add summary
-    temple_data['festival_summary'] = {
+    festival_summary = {
         'total': len(all_festivals),
         'major': len([f for f in all_festivals if f['type'] == 'major']),
         'pradosham': len([f for f in all_festivals if f['type'] == 'pradosham']),
@@ -97,16 +95,18 @@ def add_festivals_to_json():
         'year': 2025
     }
     
-    # Save updated temple data
-    with open('../design/mockups/temple_data.json', 'w', encoding='utf-8') as f:
-        json.dump(temple_data, f, ensure_ascii=False, indent=2)
+    # Rewrite temple data with the festival keys, streaming the temples through untouched
+    rewrite_json_stream('../design/mockups/temple_data.json', replace={
+        'festivals': all_festivals,
+        'festival_summary': festival_summary
+    })
     
     print(f"✅ Added {len(all_festivals)} festivals to temple_data.json")
-    print(f"   - Major: {temple_data['festival_summary']['major']}")
-    print(f"   - Pradosham: {temple_data['festival_summary']['pradosham']}")
-    print(f"   - Ekadashi: {temple_data['festival_summary']['ekadashi']}")
-    print(f"   - Pournami: {temple_data['festival_summary']['pournami']}")
-    print(f"   - Amavasya: {temple_data['festival_summary']['amavasya']}")
+    print(f"   - Major: {festival_summary['major']}")
+    print(f"   - Pradosham: {festival_summary['pradosham']}")
+    print(f"   - Ekadashi: {festival_summary['ekadashi']}")
+    print(f"   - Pournami: {festival_summary['pournami']}")
+    print(f"   - Amavasya: {festival_summary['amavasya']}")
 
 if __name__ == "__main__":
     add_festivals_to_json()
\ No newline at end of file